@@ -1,18 +1,24 @@
 import os
+import sys
+import atexit
+import signal
 import asyncio
-import json
-from datetime import datetime
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from functools import cache, lru_cache
+from typing import TYPE_CHECKING, Final
+import orjson
 from dotenv import load_dotenv
-from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-from google.adk.memory import InMemoryMemoryService
-from google.adk.tools import AgentTool, google_search, load_memory, preload_memory, FunctionTool
-from google.adk.plugins.logging_plugin import LoggingPlugin
-from google.genai import types
-from rich.console import Console
-from rich.markdown import Markdown
+from pydantic import BaseModel, Field
+
+# ADK, google.genai and Rich take a noticeable time to import, so they are
+# imported where first used; the banner shows before any of them load.
+if TYPE_CHECKING:
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import ToolContext
 
 # Load environment variables
 load_dotenv()
@@ -23,19 +29,342 @@ load_dotenv()
 MODEL_NAME = "gemini-2.5-flash"  # You can change this to any Gemini model
 # Available models: gemini-3-pro, gemini-2.5-flash,gemini-2.5-flash-lite, gemini-2.5-pro, gemini-1.5-pro, gemini-1.5-flash, etc.
 
+GENERATED_FORMAT = '%Y-%m-%d %H:%M'  # "Generated:" stamp in saved markdown files
+
+# Every run's conversation is stored here as its own session; the latest run's
+# state (current tool, research, roadmap) is carried into the next one
+# (ADK's DatabaseSessionService needs an async driver; installed with google-adk[db])
+SESSION_DB_URL = "sqlite+aiosqlite:///sessions.db"
+
+# Generate each module's lesson, examples and quiz in one structured Gemini call
+# (research/roadmap sent once) instead of three parallel specialist calls
+BATCH_MODULE_GENERATION = True
+
+# Generate module N+1 in the background after module N (uses extra tokens if the
+# user never asks for it)
+PREFETCH_NEXT_MODULE = True
+
+# Lifetime (seconds) of the Gemini context cache holding a tool's research and
+# roadmap, so later modules don't re-send them; 0 sends them inline every time
+CONTEXT_CACHE_TTL = 3600
+
+# User turns of conversation replayed to the main agent on each request; older
+# turns stay in the session (and long-term memory) but aren't re-sent
+MAX_HISTORY_TURNS = 6
+
+# Cap on specialist Gemini calls in flight at once (module builds plus background
+# prefetches); size it to your account's rate limit to avoid 429 bursts
+MAX_CONCURRENT_SPECIALISTS = 8
+
+# Extra attempts for a whole turn after a transient failure (429, 5xx, network),
+# using the backoff below; each model request already retries on its own first
+TURN_RETRIES = 2
+
 # Configure Retry Options
-retry_config = types.HttpRetryOptions(
+RETRY_OPTIONS = dict(
     attempts=5,
     exp_base=7,
     initial_delay=1,
     http_status_codes=[429, 500, 503, 504],
 )
 
+
+# One model object (and so one underlying genai client / HTTP connection pool)
+# shared by every agent
+@cache
+def get_shared_model():
+    from google.adk.models.google_llm import Gemini
+    from google.genai import types
+    return Gemini(model=MODEL_NAME, retry_options=types.HttpRetryOptions(**RETRY_OPTIONS))
+
+
+# =============================================================================
+# FILE I/O HELPERS - Blocking work run off the event loop via _run_io
+# =============================================================================
+
+# Dedicated, bounded pool for tool disk I/O so a fan-out of parallel agent tool
+# calls queues here instead of flooding the disk (or the default executor)
+_io_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool-io")
+
+
+async def _run_io(func, *args):
+    """Runs a blocking file operation on the tool I/O pool."""
+    return await asyncio.get_running_loop().run_in_executor(_io_pool, func, *args)
+
+
+# All generated lessons live under lessons/ to keep the main folder clean
+LESSONS_DIR = os.path.join(os.getcwd(), "lessons")
+
+
+@lru_cache(maxsize=512)
+def _slug(tool_name: str) -> str:
+    """Folder/file-safe name for a tool, e.g. "Lang-Chain" -> "lang_chain"."""
+    return tool_name.lower().replace(' ', '_').replace('-', '_')
+
+
+def _read_text(path: str) -> str:
+    # Read raw bytes and decode once rather than going through the text layer
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+# Lesson file contents keyed by path: (st_mtime_ns, st_size, content)
+_read_cache: dict[str, tuple[int, int, str]] = {}
+
+
+def _read_text_cached(path: str) -> str:
+    """_read_text, but repeat reads of an unchanged file only cost a stat."""
+    st = os.stat(path)
+    entry = _read_cache.get(path)
+    if entry is not None and entry[0] == st.st_mtime_ns and entry[1] == st.st_size:
+        return entry[2]
+    
+    content = _read_text(path)
+    _read_cache[path] = (st.st_mtime_ns, st.st_size, content)
+    return content
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """
+    Writes data to a temp file next to path and renames it into place, so
+    readers never see a truncated file. The temp name is per-thread so
+    concurrent writers to the same path don't collide.
+    """
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _write_text(path: str, content: str) -> None:
+    _atomic_write(path, content.encode('utf-8'))
+
+
+def _read_json(path: str) -> dict:
+    with open(path, 'rb') as f:
+        return orjson.loads(f.read())
+
+
+def _write_json(path: str, data: dict) -> None:
+    _atomic_write(path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def _append_jsonl(path: str, records: list) -> None:
+    with open(path, 'ab') as f:
+        f.write(b"".join(orjson.dumps(record) + b"\n" for record in records))
+
+
+def _iter_jsonl(path: str, offset: int = 0):
+    """
+    Lazily yields (end_offset, record) for each complete line after offset.
+    
+    A trailing line without a newline is still being appended and is left for
+    the next read.
+    """
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            if line.strip():
+                yield offset, orjson.loads(line)
+
+
+# Parsed milestone logs keyed by path: {"offset": bytes parsed, "tools": {name: [milestone, ...]}}
+_milestone_cache: dict[str, dict] = {}
+_milestone_lock = threading.Lock()
+
+
+def _load_milestones(milestones_file: str) -> dict:
+    """
+    Returns {tool_name: [milestone, ...]} for a milestone log.
+    
+    The log is append-only, so only bytes written since the previous call are
+    parsed; a file that shrank is re-read from the start.
+    """
+    with _milestone_lock:
+        try:
+            size = os.path.getsize(milestones_file)
+        except FileNotFoundError:
+            _milestone_cache.pop(milestones_file, None)
+            return {}
+        
+        entry = _milestone_cache.get(milestones_file)
+        if entry is None or size < entry["offset"]:
+            entry = _milestone_cache[milestones_file] = {"offset": 0, "tools": {}}
+        
+        if size > entry["offset"]:
+            for offset, record in _iter_jsonl(milestones_file, entry["offset"]):
+                entry["tools"].setdefault(record.pop("tool_name"), []).append(record)
+                entry["offset"] = offset
+        return entry["tools"]
+
+
+def _make_tool_folder(folder_path: str) -> list | None:
+    """Creates a tool folder, returning its file names if it already existed."""
+    os.makedirs(LESSONS_DIR, exist_ok=True)
+    try:
+        os.mkdir(folder_path)
+        return None
+    except FileExistsError:
+        # DirEntry.is_file() uses the type from readdir; skip atomic-write leftovers
+        with os.scandir(folder_path) as entries:
+            return [
+                entry.name for entry in entries
+                if entry.is_file() and not entry.name.endswith(".tmp")
+            ]
+
+
+def _save_file(folder_path: str, file_path: str, content: str) -> None:
+    os.makedirs(folder_path, exist_ok=True)
+    _write_text(file_path, content)
+
+
+def _save_module(folder_path: str, file_path: str, module_number: int, sections: tuple) -> None:
+    """Formats a module's lesson, examples and quiz and writes them as one file."""
+    lesson, examples, quiz = sections
+    content = f"""# Module {module_number}
+
+## 📚 Lesson
+
+{lesson}
+
+---
+
+## 💻 Code Examples
+
+{examples}
+
+---
+
+## 📝 Quiz
+
+{quiz}
+
+---
+
+*Generated: {datetime.now().strftime(GENERATED_FORMAT)}*
+"""
+    _save_file(folder_path, file_path, content)
+
+
+# Serializes the progress index's read-modify-write (and legacy migration)
+# across the I/O pool's workers; reentrant so _record_milestones can hold it
+# around _load_progress_index
+_progress_lock = threading.RLock()
+
+
+def _load_progress_index(user_id: str, progress_file: str, milestones_file: str) -> dict:
+    """
+    Loads the {user_id, tools: {name: {started}}} progress index.
+    
+    Older progress files kept every milestone inside the index; those are moved
+    to the append-only milestones log the first time the file is loaded.
+    """
+    with _progress_lock:
+        try:
+            progress_data = _read_json(progress_file)
+        except FileNotFoundError:
+            return {"user_id": user_id, "tools": {}}
+        
+        legacy = [
+            {"tool_name": name, **entry}
+            for name, tool in progress_data["tools"].items()
+            for entry in tool.pop("milestones", [])
+        ]
+        if legacy:
+            _append_jsonl(milestones_file, legacy)
+            _write_json(progress_file, progress_data)
+        return progress_data
+
+
+def _record_milestones(user_id: str, records: list) -> dict:
+    """
+    Appends milestone records to a user's log in one write and returns
+    {tool_name: total milestones} for the tools in records.
+    
+    The tool index is small and only rewritten when a new tool appears.
+    """
+    progress_file = f"progress_{user_id}.json"
+    milestones_file = f"progress_{user_id}.milestones.jsonl"
+    with _progress_lock:
+        progress_data = _load_progress_index(user_id, progress_file, milestones_file)
+        
+        new_tools = False
+        for record in records:
+            if record["tool_name"] not in progress_data["tools"]:
+                progress_data["tools"][record["tool_name"]] = {"started": record["timestamp"]}
+                new_tools = True
+        if new_tools:
+            _write_json(progress_file, progress_data)
+        
+        _append_jsonl(milestones_file, records)
+    
+    milestones = _load_milestones(milestones_file)
+    return {record["tool_name"]: len(milestones.get(record["tool_name"], [])) for record in records}
+
+
+# =============================================================================
+# SESSION CACHE - Write-back cache for learning session files
+# =============================================================================
+
+SESSION_FLUSH_INTERVAL = 5  # Seconds between background flushes of dirty sessions
+
+# Sessions are mutated in memory and written back by flush_sessions(). All
+# mutations happen on the event loop without an intervening await, so the
+# loop itself serializes access.
+_session_cache: dict[str, dict] = {}
+_dirty_sessions: set[str] = set()
+
+
+async def _load_session(session_file: str) -> dict | None:
+    """Returns the cached session, reading it from disk on a cache miss."""
+    session = _session_cache.get(session_file)
+    if session is None:
+        try:
+            loaded = await _run_io(_read_json, session_file)
+        except FileNotFoundError:
+            return None
+        # Another call may have populated the cache while we were reading
+        session = _session_cache.setdefault(session_file, loaded)
+    return session
+
+
+async def flush_sessions() -> None:
+    """Writes every dirty session back to disk."""
+    pending = {path: _session_cache[path] for path in _dirty_sessions}
+    _dirty_sessions.clear()
+    for path, session in pending.items():
+        await _run_io(_write_json, path, session)
+
+
+async def _periodic_session_flush(interval: float = SESSION_FLUSH_INTERVAL) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await flush_sessions()
+
+
+@atexit.register
+def _flush_sessions_at_exit() -> None:
+    # Final synchronous flush for anything the event loop didn't get to
+    while _dirty_sessions:
+        path = _dirty_sessions.pop()
+        _write_json(path, _session_cache[path])
+
+
 # =============================================================================
 # CUSTOM TOOLS - Business Logic for Learning Management
 # =============================================================================
 
-def save_learning_roadmap(tool_name: str, roadmap: str) -> dict:
+async def save_learning_roadmap(tool_name: str, roadmap: str) -> dict:
     """
     Saves a learning roadmap for a specific tool/technology to disk.
     
@@ -47,13 +376,15 @@ def save_learning_roadmap(tool_name: str, roadmap: str) -> dict:
         Dictionary with status and file path
     """
     try:
-        filename = f"roadmap_{tool_name.lower().replace(' ', '_')}.md"
+        filename = f"roadmap_{_slug(tool_name)}.md"
         filepath = os.path.join(os.getcwd(), filename)
         
-        with open(filepath, 'w') as f:
-            f.write(f"# Learning Roadmap: {tool_name}\n\n")
-            f.write(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n\n")
-            f.write(roadmap)
+        content = (
+            f"# Learning Roadmap: {tool_name}\n\n"
+            f"Generated: {datetime.now().strftime(GENERATED_FORMAT)}\n\n"
+            f"{roadmap}"
+        )
+        await _run_io(_write_text, filepath, content)
         
         return {
             "status": "success",
@@ -101,7 +432,7 @@ def create_practice_quiz(topic: str, difficulty: str = "beginner") -> dict:
         }
 
 
-def track_progress(user_id: str, tool_name: str, milestone: str, completed: bool = True) -> dict:
+async def track_progress(user_id: str, tool_name: str, milestone: str, completed: bool = True) -> dict:
     """
     Tracks learning progress for a user on a specific tool.
     
@@ -115,36 +446,18 @@ def track_progress(user_id: str, tool_name: str, milestone: str, completed: bool
         Dictionary with updated progress information
     """
     try:
-        progress_file = f"progress_{user_id}.json"
-        
-        # Load existing progress
-        if os.path.exists(progress_file):
-            with open(progress_file, 'r') as f:
-                progress_data = json.load(f)
-        else:
-            progress_data = {"user_id": user_id, "tools": {}}
-        
-        # Update progress
-        if tool_name not in progress_data["tools"]:
-            progress_data["tools"][tool_name] = {
-                "started": datetime.now().isoformat(),
-                "milestones": []
-            }
-        
-        progress_data["tools"][tool_name]["milestones"].append({
+        totals = await _run_io(_record_milestones, user_id, [{
+            "tool_name": tool_name,
             "milestone": milestone,
             "completed": completed,
             "timestamp": datetime.now().isoformat()
-        })
-        
-        # Save progress
-        with open(progress_file, 'w') as f:
-            json.dump(progress_data, f, indent=2)
+        }])
+        total = totals[tool_name]
         
         return {
             "status": "success",
             "message": f"Progress tracked: {milestone}",
-            "total_milestones": len(progress_data["tools"][tool_name]["milestones"])
+            "total_milestones": total
         }
     except Exception as e:
         return {
@@ -153,35 +466,101 @@ def track_progress(user_id: str, tool_name: str, milestone: str, completed: bool
         }
 
 
-def get_progress_summary(user_id: str) -> dict:
+async def track_progress_batch(user_id: str, events: list[dict]) -> dict:
+    """
+    Tracks several learning milestones for a user with a single write.
+    
+    Args:
+        user_id: Identifier for the user
+        events: List of {"tool_name": ..., "milestone": ..., "completed": true}
+            entries; "completed" defaults to true
+        
+    Returns:
+        Dictionary with the number of milestones recorded and per-tool totals
+    """
+    try:
+        timestamp = datetime.now().isoformat()
+        records = [
+            {
+                "tool_name": event["tool_name"],
+                "milestone": event["milestone"],
+                "completed": event.get("completed", True),
+                "timestamp": timestamp
+            }
+            for event in events
+        ]
+        if not records:
+            return {
+                "status": "success",
+                "message": "No milestones to track",
+                "tracked": 0
+            }
+        
+        totals = await _run_io(_record_milestones, user_id, records)
+        
+        return {
+            "status": "success",
+            "message": f"Progress tracked: {len(records)} milestone(s)",
+            "tracked": len(records),
+            "total_milestones": totals
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to track progress: {str(e)}"
+        }
+
+
+async def get_progress_summary(user_id: str, verbose: bool = False) -> dict:
     """
     Retrieves a summary of all learning progress for a user.
     
     Args:
         user_id: Identifier for the user
+        verbose: Include every milestone instead of per-tool counts
         
     Returns:
-        Dictionary with complete progress summary
+        Dictionary with per-tool progress (full milestone history if verbose)
     """
     try:
         progress_file = f"progress_{user_id}.json"
+        milestones_file = f"progress_{user_id}.milestones.jsonl"
         
-        if not os.path.exists(progress_file):
+        progress_data = await _run_io(
+            _load_progress_index, user_id, progress_file, milestones_file
+        )
+        
+        if not progress_data["tools"]:
             return {
                 "status": "success",
                 "message": "No progress recorded yet",
                 "tools_count": 0,
                 "tools": {}
             }
+        milestones = await _run_io(_load_milestones, milestones_file)
         
-        with open(progress_file, 'r') as f:
-            progress_data = json.load(f)
+        if verbose:
+            # Rebuild the per-tool milestone history from the log
+            tools = {
+                name: {"started": tool["started"], "milestones": list(milestones.get(name, []))}
+                for name, tool in progress_data["tools"].items()
+            }
+        else:
+            # Counts and the latest milestone keep the response (and prompt) small
+            tools = {}
+            for name, tool in progress_data["tools"].items():
+                history = milestones.get(name, [])
+                tools[name] = {
+                    "started": tool["started"],
+                    "milestones_done": sum(1 for entry in history if entry["completed"]),
+                    "last": history[-1]["milestone"] if history else None
+                }
         
         summary = {
             "status": "success",
             "user_id": user_id,
-            "tools_count": len(progress_data["tools"]),
-            "tools": progress_data["tools"]
+            "tools_count": len(tools),
+            "tools": tools
         }
         
         return summary
@@ -192,7 +571,88 @@ def get_progress_summary(user_id: str) -> dict:
         }
 
 
-def manage_learning_session(user_id: str, tool_name: str, action: str, module_name: str = "") -> dict:
+def _start_session(session: dict | None, user_id: str, tool_name: str, module_name: str) -> tuple:
+    # Initialize new learning session
+    session = {
+        "user_id": user_id,
+        "tool_name": tool_name,
+        "started": datetime.now().isoformat(),
+        "current_module": 0,
+        "modules_completed": [],
+        "status": "in_progress"
+    }
+    return {
+        "status": "success",
+        "message": f"Started learning session for {tool_name}",
+        "session": session
+    }, session
+
+
+def _next_module(session: dict | None, user_id: str, tool_name: str, module_name: str) -> tuple:
+    # Move to next module
+    if session is None:
+        return {
+            "status": "error",
+            "error_message": "No active session found. Start a new session first."
+        }, None
+    
+    session["current_module"] += 1
+    return {
+        "status": "success",
+        "message": f"Advanced to module {session['current_module']}",
+        "current_module": session["current_module"]
+    }, session
+
+
+def _complete_module(session: dict | None, user_id: str, tool_name: str, module_name: str) -> tuple:
+    # Mark current module as completed
+    if session is None:
+        return {
+            "status": "error",
+            "error_message": "No active session found"
+        }, None
+    
+    session["modules_completed"].append({
+        "module_number": session["current_module"],
+        "module_name": module_name if module_name else f"Module {session['current_module']}",
+        "completed_at": datetime.now().isoformat()
+    })
+    return {
+        "status": "success",
+        "message": f"Module {session['current_module']} completed!",
+        "modules_completed": len(session["modules_completed"])
+    }, session
+
+
+def _get_current(session: dict | None, user_id: str, tool_name: str, module_name: str) -> tuple:
+    # Get current session status
+    if session is None:
+        return {
+            "status": "success",
+            "message": "No active session",
+            "session": None
+        }, None
+    
+    return {
+        "status": "success",
+        "tool_name": session["tool_name"],
+        "started": session["started"],
+        "current_module": session["current_module"],
+        "modules_completed": len(session["modules_completed"]),
+        "session_status": session["status"]
+    }, None
+
+
+# Each handler returns (result, session); a returned session is stored and marked dirty
+_SESSION_ACTIONS = {
+    "start": _start_session,
+    "next_module": _next_module,
+    "complete_module": _complete_module,
+    "get_current": _get_current,
+}
+
+
+async def manage_learning_session(user_id: str, tool_name: str, action: str, module_name: str = "") -> dict:
     """
     Manages interactive learning sessions for teaching modules step-by-step.
     
@@ -206,96 +666,22 @@ def manage_learning_session(user_id: str, tool_name: str, action: str, module_na
         Dictionary with session status and next steps
     """
     try:
-        session_file = f"session_{user_id}_{tool_name.lower().replace(' ', '_')}.json"
-        
-        if action == "start":
-            # Initialize new learning session
-            session = {
-                "user_id": user_id,
-                "tool_name": tool_name,
-                "started": datetime.now().isoformat(),
-                "current_module": 0,
-                "modules_completed": [],
-                "status": "in_progress"
-            }
-            with open(session_file, 'w') as f:
-                json.dump(session, f, indent=2)
-            
+        handler = _SESSION_ACTIONS.get(action)
+        if handler is None:
             return {
-                "status": "success",
-                "message": f"Started learning session for {tool_name}",
-                "session": session
+                "status": "error",
+                "error_message": f"Unknown action: {action}"
             }
         
-        elif action == "next_module":
-            # Move to next module
-            if os.path.exists(session_file):
-                with open(session_file, 'r') as f:
-                    session = json.load(f)
-                
-                session["current_module"] += 1
-                with open(session_file, 'w') as f:
-                    json.dump(session, f, indent=2)
-                
-                return {
-                    "status": "success",
-                    "message": f"Advanced to module {session['current_module']}",
-                    "current_module": session["current_module"]
-                }
-            else:
-                return {
-                    "status": "error",
-                    "error_message": "No active session found. Start a new session first."
-                }
+        session_file = f"session_{user_id}_{tool_name.lower().replace(' ', '_')}.json"
+        session = await _load_session(session_file)
         
-        elif action == "complete_module":
-            # Mark current module as completed
-            if os.path.exists(session_file):
-                with open(session_file, 'r') as f:
-                    session = json.load(f)
-                
-                session["modules_completed"].append({
-                    "module_number": session["current_module"],
-                    "module_name": module_name if module_name else f"Module {session['current_module']}",
-                    "completed_at": datetime.now().isoformat()
-                })
-                
-                with open(session_file, 'w') as f:
-                    json.dump(session, f, indent=2)
-                
-                return {
-                    "status": "success",
-                    "message": f"Module {session['current_module']} completed!",
-                    "modules_completed": len(session["modules_completed"])
-                }
-            else:
-                return {
-                    "status": "error",
-                    "error_message": "No active session found"
-                }
+        result, updated = handler(session, user_id, tool_name, module_name)
+        if updated is not None:
+            _session_cache[session_file] = updated
+            _dirty_sessions.add(session_file)
         
-        elif action == "get_current":
-            # Get current session status
-            if os.path.exists(session_file):
-                with open(session_file, 'r') as f:
-                    session = json.load(f)
-                return {
-                    "status": "success",
-                    "session": session
-                }
-            else:
-                return {
-                    "status": "success",
-                    "message": "No active session",
-                    "session": None
-                }
-        
-        else:
-            return {
-                "status": "error",
-                "error_message": f"Unknown action: {action}"
-            }
-            
+        return result
     except Exception as e:
         return {
             "status": "error",
@@ -303,7 +689,7 @@ def manage_learning_session(user_id: str, tool_name: str, action: str, module_na
         }
 
 
-def create_tool_folder(tool_name: str) -> dict:
+async def create_tool_folder(tool_name: str) -> dict:
     """
     Creates a dedicated folder for a specific tool/technology under lessons/.
     Checks if folder exists first.
@@ -315,18 +701,14 @@ def create_tool_folder(tool_name: str) -> dict:
         Dictionary with folder path and status
     """
     try:
-        folder_name = tool_name.lower().replace(' ', '_').replace('-', '_')
+        folder_name = _slug(tool_name)
         # Create under lessons/ directory to keep main folder clean
-        lessons_dir = os.path.join(os.getcwd(), "lessons")
-        folder_path = os.path.join(lessons_dir, folder_name)
+        folder_path = os.path.join(LESSONS_DIR, folder_name)
         
-        # Ensure lessons directory exists
-        if not os.path.exists(lessons_dir):
-            os.makedirs(lessons_dir)
+        files = await _run_io(_make_tool_folder, folder_path)
         
-        if os.path.exists(folder_path):
+        if files is not None:
             # Folder already exists
-            files = os.listdir(folder_path)
             return {
                 "status": "exists",
                 "message": f"Folder 'lessons/{folder_name}' already exists",
@@ -334,8 +716,6 @@ def create_tool_folder(tool_name: str) -> dict:
                 "existing_files": files
             }
         else:
-            # Create new folder
-            os.makedirs(folder_path)
             return {
                 "status": "created",
                 "message": f"Created new folder 'lessons/{folder_name}'",
@@ -349,7 +729,7 @@ def create_tool_folder(tool_name: str) -> dict:
         }
 
 
-def save_to_tool_folder(tool_name: str, filename: str, content: str) -> dict:
+async def save_to_tool_folder(tool_name: str, filename: str, content: str) -> dict:
     """
     Saves content to a file within the tool's folder under lessons/.
     
@@ -362,18 +742,12 @@ def save_to_tool_folder(tool_name: str, filename: str, content: str) -> dict:
         Dictionary with save status and file path
     """
     try:
-        folder_name = tool_name.lower().replace(' ', '_').replace('-', '_')
-        lessons_dir = os.path.join(os.getcwd(), "lessons")
-        folder_path = os.path.join(lessons_dir, folder_name)
-        
-        # Ensure folders exist
-        if not os.path.exists(folder_path):
-            os.makedirs(folder_path)
+        folder_name = _slug(tool_name)
+        folder_path = os.path.join(LESSONS_DIR, folder_name)
         
         file_path = os.path.join(folder_path, filename)
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        await _run_io(_save_file, folder_path, file_path, content)
         
         return {
             "status": "success",
@@ -387,7 +761,7 @@ def save_to_tool_folder(tool_name: str, filename: str, content: str) -> dict:
         }
 
 
-def read_from_tool_folder(tool_name: str, filename: str) -> dict:
+async def read_from_tool_folder(tool_name: str, filename: str) -> dict:
     """
     Reads content from a file in the tool's folder under lessons/.
     
@@ -399,21 +773,19 @@ def read_from_tool_folder(tool_name: str, filename: str) -> dict:
         Dictionary with file content or error
     """
     try:
-        folder_name = tool_name.lower().replace(' ', '_').replace('-', '_')
-        lessons_dir = os.path.join(os.getcwd(), "lessons")
-        folder_path = os.path.join(lessons_dir, folder_name)
+        folder_name = _slug(tool_name)
+        folder_path = os.path.join(LESSONS_DIR, folder_name)
         file_path = os.path.join(folder_path, filename)
         
-        if not os.path.exists(file_path):
+        try:
+            content = await _run_io(_read_text_cached, file_path)
+        except FileNotFoundError:
             return {
                 "status": "not_found",
                 "message": f"File '{filename}' not found in lessons/{folder_name}/",
                 "content": None
             }
         
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         return {
             "status": "success",
             "message": f"Read '{filename}' from lessons/{folder_name}/",
@@ -428,7 +800,7 @@ def read_from_tool_folder(tool_name: str, filename: str) -> dict:
         }
 
 
-def assemble_module_file(tool_name: str, module_number: int, lesson: str, examples: str, quiz: str) -> dict:
+async def assemble_module_file(tool_name: str, module_number: int, lesson: str, examples: str, quiz: str) -> dict:
     """
     Assembles lesson, examples, and quiz into one module markdown file.
     
@@ -443,37 +815,22 @@ def assemble_module_file(tool_name: str, module_number: int, lesson: str, exampl
         Dictionary with assembled file path
     """
     try:
-        # Build comprehensive module content
-        module_content = f"""# Module {module_number}
-
-## 📚 Lesson
-
-{lesson}
-
----
-
-## 💻 Code Examples
-
-{examples}
-
----
-
-## 📝 Quiz
-
-{quiz}
-
----
-
-*Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}*
-"""
+        folder_name = _slug(tool_name)
+        folder_path = os.path.join(LESSONS_DIR, folder_name)
         
         filename = f"module_{module_number}.md"
-        result = save_to_tool_folder(tool_name, filename, module_content)
+        file_path = os.path.join(folder_path, filename)
         
-        # Add absolute path to result for agent reference
-        result["absolute_path"] = os.path.abspath(os.path.join("lessons", tool_name, filename))
+        # Formatting and writing the (large) module both happen off the event loop
+        await _run_io(_save_module, folder_path, file_path, module_number, (lesson, examples, quiz))
         
-        return result
+        return {
+            "status": "success",
+            "message": f"Saved '{filename}' to lessons/{folder_name}/",
+            "file_path": file_path,
+            # Absolute path for agent reference
+            "absolute_path": file_path
+        }
     except Exception as e:
         return {
             "status": "error",
@@ -482,15 +839,10 @@ def assemble_module_file(tool_name: str, module_number: int, lesson: str, exampl
 
 
 # =============================================================================
-# SPECIALIST AGENTS DEFINITIONS
+# AGENT INSTRUCTIONS
 # =============================================================================
 
-# 1. Researcher Agent - Finds information about AI tools
-researcher_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="researcher_agent",
-    description="Research specialist that finds comprehensive information about AI tools and technologies.",
-    instruction="""
+_RESEARCHER_INSTR: Final[str] = """
     You are a Research Specialist Agent.
     
     **Your Mission:**
@@ -517,16 +869,9 @@ researcher_agent = LlmAgent(
     - Provide context about the tool's ecosystem and alternatives
     - Be honest about limitations or complexity
     - Return complete research in clean Markdown format
-    """,
-    tools=[google_search]
-)
+    """
 
-# 2. Planner Agent - Creates structured learning plans
-planner_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="planner_agent",
-    description="Learning plan architect that creates comprehensive, structured learning roadmaps.",
-    instruction="""
+_PLANNER_INSTR: Final[str] = """
     You are a Learning Plan Architect.
     
     **Your Mission:**
@@ -567,16 +912,9 @@ planner_agent = LlmAgent(
     2. **Quality Standards:**
     Format in clear Markdown with headers, lists, and emphasis.
     Make modules granular and teachable - each should be completable in 1-2 hours.
-    """,
-    tools=[]
-)
+    """
 
-# 3. Example Agent - Generates code examples
-example_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="example_agent",
-    description="Code example specialist that creates practical, well-commented code demonstrations.",
-    instruction="""
+_EXAMPLE_INSTR: Final[str] = """
     You are a Code Example Specialist.
     
     **Your Mission:**
@@ -622,21 +960,15 @@ example_agent = LlmAgent(
     **Output Format:**
     Return examples in clean Markdown with proper code blocks.
     DO NOT save files - just return the content.
-    """,
-    tools=[]
-)
+    """
 
-# 4. Tracker Agent - Manages learning progress
-tracker_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="tracker_agent",
-    description="Progress tracking and motivation specialist.",
-    instruction="""
+_TRACKER_INSTR: Final[str] = """
     You are a Progress Tracker and Motivational Coach.
     
     **Your Tools:**
-    - `track_progress`: Record learning milestones
-    - `get_progress_summary`: Retrieve complete progress history
+    - `track_progress`: Record a learning milestone
+    - `track_progress_batch`: Record several milestones at once
+    - `get_progress_summary`: Retrieve a progress summary (pass verbose=True for every milestone)
     - `load_memory`: Access conversation history and context
     
     **Tracking Protocol:**
@@ -644,6 +976,8 @@ tracker_agent = LlmAgent(
        - Tool name they're learning
        - Specific milestone completed
        - Completion status
+       When several milestones are completed together (e.g. at the end of a module),
+       record them all in ONE `track_progress_batch` call instead.
     
     2. Common milestones to track:
        - "Started learning [tool]"
@@ -653,7 +987,7 @@ tracker_agent = LlmAgent(
        - "Finished learning plan"
     
     3. When users ask about progress:
-       - Use get_progress_summary to retrieve full history
+       - Use get_progress_summary to retrieve progress (verbose=True only if they ask for the full history)
        - Provide encouraging summary
        - Highlight achievements
        - Suggest next steps
@@ -667,16 +1001,9 @@ tracker_agent = LlmAgent(
     - Use positive, energizing language
     
     **Always record milestones automatically when users mention completing something!**
-    """,
-    tools=[track_progress, get_progress_summary, load_memory]
-)
+    """
 
-# 5. Notifier Agent - Sends notifications and updates
-notifier_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="notifier_agent",
-    description="Notification and alert specialist for important updates.",
-    instruction="""
+_NOTIFIER_INSTR: Final[str] = """
     You are a Notification Specialist. You create clear, engaging notifications.
     
     **Notification Types:**
@@ -707,16 +1034,9 @@ notifier_agent = LlmAgent(
     - Keep messages concise but complete
     - Always end with encouragement or next action
     - Match tone to notification type (celebratory, helpful, informative)
-    """,
-    tools=[]
-)
+    """
 
-# 6. Quiz Agent - Creates comprehensive quizzes with gradual difficulty
-quiz_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="quiz_agent",
-    description="Comprehensive quiz generator with gradual difficulty progression.",
-    instruction="""
+_QUIZ_INSTR: Final[str] = """
     You are a Quiz Specialist.
     
     **Your Mission:**
@@ -782,16 +1102,9 @@ quiz_agent = LlmAgent(
     - Provide detailed explanations for each answer
     - Include a summary at the end: "Score X/Y to pass"
     - DO NOT save files - just return the quiz content
-    """,
-    tools=[]
-)
+    """
 
-# 7. Teacher Agent - Creates comprehensive lessons for modules
-teacher_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="teacher_agent",
-    description="Expert educator that creates comprehensive, engaging lessons for each module.",
-    instruction="""
+_TEACHER_INSTR: Final[str] = """
     You are an Expert Teacher and Curriculum Designer.
     
     **Your Mission:**
@@ -848,184 +1161,897 @@ teacher_agent = LlmAgent(
     - Reference provided roadmap for module scope
     - Focus on TEACHING, not just information dump
     - Make it engaging and accessible
-    """,
-    tools=[]
-)
+    """
+
+_MAIN_INSTR: Final[str] = """
+    You are the Master Orchestrator for newToolNoProblem - an intelligent learning assistant.
+    Your tools do the file handling and specialist coordination; pick the one that matches the user's intent.
+    The tool the user is currently learning (use it when they don't name one): {context_tool?}
+    
+    - "I want to learn [tool]": call `create_learning_plan(tool_name)` and present the roadmap it returns.
+    - "Start module N": call `build_module(tool_name, N)`, show the module (`read_from_tool_folder`), and
+      tell the user: "I've saved the complete module to: [absolute_path]". Suggest opening it in a Markdown
+      viewer (like VS Code or Obsidian). Then ask `tracker_agent` to record progress and `notifier_agent` to celebrate.
+    - Progress questions: ask `tracker_agent`.
+    """
+
+
+_MODULE_BUILDER_INSTR: Final[str] = """
+    You are a Module Builder. You create ONE complete learning module - lesson, code
+    examples and quiz - based on the research and roadmap data provided to you.
+    
+    **Output Format:**
+    Return JSON with three Markdown fields. Base ALL of it on the provided research and
+    use the roadmap for the module's scope. Don't make up facts.
+    
+    **1. `lesson`** - teach the module's concepts clearly and thoroughly:
+    - **Module Introduction**: why it matters, learning objectives, prerequisites, estimated time
+    - **Core Concepts**: simple explanations, analogies, clearly defined terms, basics to advanced
+    - **Key Takeaways**: must-remember concepts, common pitfalls, best practices
+    - **Practice Guidance**: what to try next, pointers to the examples, preview of the next module
+    Use clear, conversational, encouraging language - focus on TEACHING, not an information dump.
+    
+    **2. `examples`** - 3-5 progressive, executable code examples:
+    - Basic usage (beginner), an intermediate pattern, an advanced/real-world scenario
+    - Each with a title, its purpose, imports, inline comments and the expected output
+    - Include error handling and common pitfalls with their solutions
+    - Use Python unless the research indicates otherwise
+    
+    **3. `quiz`** - 10-15 questions with gradual difficulty:
+    - **Easy (40%)**: recall and comprehension
+    - **Medium (40%)**: application and analysis
+    - **Hard (20%)**: synthesis and evaluation
+    - Mix multiple choice (4 options), true/false, short answer, code analysis and practical scenarios
+    - Label each question's difficulty, e.g. `### Question 1 [Easy]`
+    - Give the **Answer** and an **Explanation** for every question
+    - End with a summary: "Score X/Y to pass"
+    """
+
+
+class ModuleBundle(BaseModel):
+    """Structured output of the module builder: one module's three sections."""
+    lesson: str = Field(description="Lesson content in Markdown")
+    examples: str = Field(description="Code examples in Markdown")
+    quiz: str = Field(description="Quiz questions and answers in Markdown")
+
 
 # =============================================================================
-# MAIN ORCHESTRATOR AGENT
+# SPECIALIST AGENTS DEFINITIONS
 # =============================================================================
 
-# Main Agent - Orchestrates specialist agents (ADK recommended pattern)
-main_agent = LlmAgent(
-    model=Gemini(model=MODEL_NAME, retry_options=retry_config),
-    name="main_agent",
-    description="Master orchestrator for the newToolNoProblem AI Learning Assistant.",
-    instruction="""
-    You are the Master Orchestrator for newToolNoProblem - an intelligent learning assistant.
+# Agents are built on first use (and then cached) rather than at import time,
+# so importing this module stays cheap and unused agents are never created.
+
+# 1. Researcher Agent - Finds information about AI tools
+@cache
+def get_researcher_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import google_search
+    return LlmAgent(
+        model=get_shared_model(),
+        name="researcher_agent",
+        description="Research specialist that finds comprehensive information about AI tools and technologies.",
+        instruction=_RESEARCHER_INSTR,
+        tools=[google_search]
+    )
+
+
+# 2. Planner Agent - Creates structured learning plans
+@cache
+def get_planner_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    return LlmAgent(
+        model=get_shared_model(),
+        name="planner_agent",
+        description="Learning plan architect that creates comprehensive, structured learning roadmaps.",
+        instruction=_PLANNER_INSTR,
+        tools=[]
+    )
+
+
+# 3. Example Agent - Generates code examples
+@cache
+def get_example_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    return LlmAgent(
+        model=get_shared_model(),
+        name="example_agent",
+        description="Code example specialist that creates practical, well-commented code demonstrations.",
+        instruction=_EXAMPLE_INSTR,
+        tools=[]
+    )
+
+
+# 4. Tracker Agent - Manages learning progress
+@cache
+def get_tracker_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import load_memory
+    return LlmAgent(
+        model=get_shared_model(),
+        name="tracker_agent",
+        description="Progress tracking and motivation specialist.",
+        instruction=_TRACKER_INSTR,
+        tools=[track_progress, track_progress_batch, get_progress_summary, load_memory]
+    )
+
+
+# 5. Notifier Agent - Sends notifications and updates
+@cache
+def get_notifier_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    return LlmAgent(
+        model=get_shared_model(),
+        name="notifier_agent",
+        description="Notification and alert specialist for important updates.",
+        instruction=_NOTIFIER_INSTR,
+        tools=[]
+    )
+
+
+# 6. Quiz Agent - Creates comprehensive quizzes with gradual difficulty
+@cache
+def get_quiz_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    return LlmAgent(
+        model=get_shared_model(),
+        name="quiz_agent",
+        description="Comprehensive quiz generator with gradual difficulty progression.",
+        instruction=_QUIZ_INSTR,
+        tools=[]
+    )
+
+
+# 7. Teacher Agent - Creates comprehensive lessons for modules
+@cache
+def get_teacher_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    return LlmAgent(
+        model=get_shared_model(),
+        name="teacher_agent",
+        description="Expert educator that creates comprehensive, engaging lessons for each module.",
+        instruction=_TEACHER_INSTR,
+        tools=[]
+    )
+
+
+# 8. Module Builder Agent - Lesson, examples and quiz in one structured response
+@cache
+def get_module_builder_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    return LlmAgent(
+        model=get_shared_model(),
+        name="module_builder_agent",
+        description="Creates a module's lesson, code examples and quiz in a single structured response.",
+        instruction=_MODULE_BUILDER_INSTR,
+        output_schema=ModuleBundle,
+        before_model_callback=_use_context_cache
+    )
+
+
+# =============================================================================
+# MODULE BUILDER - Parallel specialist fan-out
+# =============================================================================
+
+_specialist_slots = asyncio.Semaphore(MAX_CONCURRENT_SPECIALISTS)
+
+
+# Specialist runs are one-shot, so their sessions never need to hit the database
+@cache
+def _specialist_sessions():
+    from google.adk.sessions import InMemorySessionService
+    return InMemorySessionService()
+
+
+async def _run_specialist(agent: "LlmAgent", request: str, state: dict | None = None) -> str:
+    """Runs a specialist on one request in a throwaway session and returns its final text."""
+    from google.adk.runners import Runner
+    from google.genai import types
+    
+    sessions = _specialist_sessions()
+    
+    # Waiting for a slot queues the call instead of bursting into 429s
+    async with _specialist_slots:
+        session = await sessions.create_session(app_name=agent.name, user_id="module_builder", state=state)
+        runner = Runner(agent=agent, app_name=agent.name, session_service=sessions)
+        
+        text = ""
+        try:
+            async for event in runner.run_async(
+                user_id=session.user_id,
+                session_id=session.id,
+                new_message=types.Content(role="user", parts=[types.Part(text=request)])
+            ):
+                if event.is_final_response() and event.content and event.content.parts:
+                    text = "".join(part.text or "" for part in event.content.parts)
+        finally:
+            await sessions.delete_session(
+                app_name=agent.name,
+                user_id=session.user_id,
+                session_id=session.id
+            )
+    return text
+
+
+# _context_key -> (cache name, monotonic time it stops being reused); a None
+# name records that caching failed, so it isn't retried on every module build
+_context_caches: dict[str, tuple[str | None, float]] = {}
+
+
+def _context_key(research: str, roadmap: str) -> str:
+    # The model and instruction are part of the cache as well
+    content = f"{MODEL_NAME}\0{_MODULE_BUILDER_INSTR}\0{research}\0{roadmap}"
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _seconds_left(cached_content) -> float:
+    if cached_content.expire_time is None:
+        return CONTEXT_CACHE_TTL
+    return (cached_content.expire_time - datetime.now(timezone.utc)).total_seconds()
+
+
+async def _find_context_cache(client, display_name: str):
+    """Returns the live cache with this display name (e.g. from an earlier run), if any."""
+    async for cached_content in await client.aio.caches.list():
+        if cached_content.display_name == display_name:
+            return cached_content
+    return None
+
+
+async def _get_context_cache(research: str, roadmap: str) -> str | None:
+    """
+    Returns the name of a Gemini context cache holding the module builder's
+    instruction plus this research and roadmap, creating it on first use.
+    Returns None when caching is off or unavailable (e.g. the content is
+    below the model's minimum cacheable size).
+    """
+    if not CONTEXT_CACHE_TTL:
+        return None
+    
+    key = _context_key(research, roadmap)
+    cached = _context_caches.get(key)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]  # None after a recent failure: send the context inline
+    
+    from google.genai import types
+    client = get_shared_model().api_client
+    display_name = f"module-context-{key[:32]}"
+    # Stop reusing a cache a little before it expires server-side
+    margin = CONTEXT_CACHE_TTL * 0.1
+    try:
+        # Reuse a cache that an earlier run created for the same content rather
+        # than paying for a second copy until the first one expires
+        cached_content = await _find_context_cache(client, display_name)
+        if cached_content is None or _seconds_left(cached_content) <= margin:
+            cached_content = await client.aio.caches.create(
+                model=MODEL_NAME,
+                config=types.CreateCachedContentConfig(
+                    display_name=display_name,
+                    system_instruction=_MODULE_BUILDER_INSTR,
+                    contents=[types.Content(role="user", parts=[types.Part(
+                        text=f"Research:\n\n{research}\n\nRoadmap:\n\n{roadmap}"
+                    )])],
+                    ttl=f"{CONTEXT_CACHE_TTL}s"
+                )
+            )
+    except Exception:
+        # e.g. below the model's minimum cacheable size, quota or permissions
+        _context_caches[key] = (None, time.monotonic() + CONTEXT_CACHE_TTL)
+        return None
+    
+    _context_caches[key] = (cached_content.name, time.monotonic() + _seconds_left(cached_content) - margin)
+    return cached_content.name
+
+
+def _use_context_cache(callback_context, llm_request):
+    """before_model_callback: sends the request against the cache named in session state."""
+    cache_name = callback_context.state.get("context_cache")
+    if cache_name:
+        # The cache already carries the system instruction; Gemini rejects both
+        llm_request.config.cached_content = cache_name
+        llm_request.config.system_instruction = None
+    return None
+
+
+async def _load_module_context(tool_name: str, tool_context: "ToolContext") -> tuple | None:
+    """
+    Returns (research, roadmap) for a tool from session state, reading
+    research.md and roadmap.md into state on a miss.
+    Returns None if either file doesn't exist yet.
+    """
+    state = tool_context.state
+    if state.get("context_tool") == _slug(tool_name):
+        return state["research"], state["roadmap"]
+    
+    research, roadmap = await asyncio.gather(
+        read_from_tool_folder(tool_name, "research.md"),
+        read_from_tool_folder(tool_name, "roadmap.md")
+    )
+    if research["status"] != "success" or roadmap["status"] != "success":
+        return None
+    
+    state["context_tool"] = _slug(tool_name)
+    state["research"] = research["content"]
+    state["roadmap"] = roadmap["content"]
+    return research["content"], roadmap["content"]
+
+
+async def create_learning_plan(tool_name: str, tool_context: "ToolContext") -> dict:
+    """
+    Sets up a tool's lessons folder with research.md and roadmap.md, running
+    the researcher and planner only for files that don't exist yet, and loads
+    both into session state for module generation.
     
-    **Your Role:**
-    You are the central hub. You manage all files and coordinate your team of specialists.
-    Your specialists DO NOT touch files. You must read/write files for them.
-    
-    **Your Specialist Team:**
-    - `researcher_agent`: Researches tools (Returns content only)
-    - `planner_agent`: Creates roadmaps (Returns content only)
-    - `teacher_agent`: Creates lessons (Returns content only)
-    - `example_agent`: Generates examples (Returns content only)
-    - `quiz_agent`: Creates quizzes (Returns content only)
-    - `tracker_agent`: Tracks progress
-    - `notifier_agent`: Sends messages
-    
-    **Complete Workflow:**
-    
-    **Phase 1: Research & Planning**
-    User: "I want to learn [tool]"
-    
-    1. **Setup:**
-       - Call `create_tool_folder(tool_name)`
-    
-    2. **Research:**
-       - Check if `research.md` exists using `read_from_tool_folder`
-       - If NOT found:
-         - Ask `researcher_agent` to research the tool
-         - Save their response to `research.md` using `save_to_tool_folder`
-       - If found: Read it to use for next steps
-    
-    3. **Planning:**
-       - Check if `roadmap.md` exists
-       - If NOT found:
-         - Read `research.md` content
-         - Ask `planner_agent`: "Create a learning roadmap based on this research: [insert research content]"
-         - Save their response to `roadmap.md`
-       - Present roadmap to user
-    
-    **Phase 2: Module Generation**
-    User: "Start module 1"
-    
-    1. **Prepare Context:**
-       - Read `research.md` content
-       - Read `roadmap.md` content
-    
-    2. **Generate Content (Parallel-ish):**
-       - Ask `teacher_agent`: "Create a lesson for Module 1 based on this research: [content] and roadmap: [content]"
-       - Ask `example_agent`: "Create code examples for Module 1 based on this research: [content]"
-       - Ask `quiz_agent`: "Create a quiz for Module 1 based on this research: [content]"
-    
-    3. **Assemble & Save:**
-       - Call `assemble_module_file` with the outputs from the 3 agents
-       - This will save `module_1.md` automatically
-    
-    4. **Present & Track:**
-       - Read the saved `module_1.md` and show it to the user
-       - **CRITICAL:** Tell the user: "I've saved the complete module to: [absolute_path]"
-       - Suggest: "You can open this file in your favorite Markdown viewer (like VS Code or Obsidian) for the best experience."
-       - Call `tracker_agent` to record progress
-       - Call `notifier_agent` to celebrate
-    
-    **Key Rules:**
-    - **YOU manage the files.** Agents just generate text.
-    - **ALWAYS pass context.** Agents don't know what "research.md" is unless you read it and paste the content in your prompt to them.
-    - **Save everything.** Don't lose the agents' hard work.
-    """,
-    tools=[
-        AgentTool(agent=researcher_agent),
-        AgentTool(agent=planner_agent),
-        AgentTool(agent=teacher_agent),
-        AgentTool(agent=example_agent),
-        AgentTool(agent=quiz_agent),
-        AgentTool(agent=tracker_agent),
-        AgentTool(agent=notifier_agent),
-        FunctionTool(func=create_tool_folder),
-        FunctionTool(func=save_to_tool_folder),
-        FunctionTool(func=read_from_tool_folder),
-        FunctionTool(func=assemble_module_file)
+    Args:
+        tool_name: Name of the tool to learn
+        
+    Returns:
+        Dictionary with the roadmap and which files were generated
+    """
+    try:
+        folder_name = _slug(tool_name)
+        folder_path = os.path.join(LESSONS_DIR, folder_name)
+        await _run_io(_make_tool_folder, folder_path)
+        
+        research, roadmap = await asyncio.gather(
+            read_from_tool_folder(tool_name, "research.md"),
+            read_from_tool_folder(tool_name, "roadmap.md")
+        )
+        research = research.get("content")
+        roadmap = roadmap.get("content")
+        
+        # Each file is saved as soon as it's generated, so a failed planner run
+        # doesn't throw away the (search-heavy) research. An empty file would
+        # pass for existing on every later run, so empty output is never saved.
+        generated = []
+        if research is None:
+            research = await _run_specialist(get_researcher_agent(), f"Research {tool_name}.")
+            if not research.strip():
+                return {
+                    "status": "error",
+                    "error_message": f"The researcher returned no content for {tool_name}. Please try again."
+                }
+            await _run_io(_save_file, folder_path, os.path.join(folder_path, "research.md"), research)
+            generated.append("research.md")
+        if roadmap is None:
+            roadmap = await _run_specialist(
+                get_planner_agent(),
+                f"Create a learning roadmap based on this research:\n\n{research}"
+            )
+            if not roadmap.strip():
+                return {
+                    "status": "error",
+                    "error_message": f"The planner returned no roadmap for {tool_name}. Please try again."
+                }
+            await _run_io(_save_file, folder_path, os.path.join(folder_path, "roadmap.md"), roadmap)
+            generated.append("roadmap.md")
+        
+        state = tool_context.state
+        state["context_tool"] = folder_name
+        state["research"] = research
+        state["roadmap"] = roadmap
+        
+        return {
+            "status": "success",
+            "folder_path": folder_path,
+            "generated": generated,
+            "roadmap": roadmap
+        }
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to create learning plan: {str(e)}"
+        }
+
+
+async def _generate_module_content(module_number: int, research: str, roadmap: str) -> tuple:
+    """Returns (lesson, examples, quiz) for a module."""
+    if BATCH_MODULE_GENERATION:
+        text = None
+        cache_name = await _get_context_cache(research, roadmap)
+        if cache_name:
+            try:
+                text = await _run_specialist(
+                    get_module_builder_agent(),
+                    f"Create the complete Module {module_number} (lesson, code examples and quiz) "
+                    "based on the research and roadmap above.",
+                    state={"context_cache": cache_name}
+                )
+            except Exception:
+                # Cache expired or was deleted; send the context inline instead
+                _context_caches.pop(_context_key(research, roadmap), None)
+        if text is None:
+            text = await _run_specialist(
+                get_module_builder_agent(),
+                f"Create the complete Module {module_number} (lesson, code examples and quiz) "
+                f"based on this research:\n\n{research}\n\nand roadmap:\n\n{roadmap}"
+            )
+        try:
+            bundle = ModuleBundle.model_validate(orjson.loads(text))
+            return bundle.lesson, bundle.examples, bundle.quiz
+        except ValueError:
+            pass  # Malformed structured output; fall back to the specialists
+    
+    # Run the teacher, example and quiz specialists concurrently
+    names = ("lesson", "examples", "quiz")
+    results = await asyncio.gather(
+        _run_specialist(
+            get_teacher_agent(),
+            f"Create a lesson for Module {module_number} based on this research:\n\n{research}\n\n"
+            f"and roadmap:\n\n{roadmap}"
+        ),
+        _run_specialist(
+            get_example_agent(),
+            f"Create code examples for Module {module_number} based on this research:\n\n{research}"
+        ),
+        _run_specialist(
+            get_quiz_agent(),
+            f"Create a quiz for Module {module_number} based on this research:\n\n{research}"
+        ),
+        return_exceptions=True
+    )
+    
+    failed = [f"{name}: {result}" for name, result in zip(names, results) if isinstance(result, BaseException)]
+    if failed:
+        raise RuntimeError("; ".join(failed))
+    return tuple(results)
+
+
+# Speculative builds of the module after the one just generated, keyed by
+# (tool slug, module number, hash of research, hash of roadmap)
+_module_prefetch: dict[tuple, asyncio.Task] = {}
+
+
+def _prefetch_key(tool_name: str, module_number: int, research: str, roadmap: str) -> tuple:
+    return (_slug(tool_name), module_number, hash(research), hash(roadmap))
+
+
+def _schedule_prefetch(tool_name: str, module_number: int, research: str, roadmap: str) -> None:
+    """Starts generating a module in the background, replacing any other speculative build."""
+    # Only prefetch modules the roadmap actually has
+    if not PREFETCH_NEXT_MODULE or f"Module {module_number}" not in roadmap:
+        return
+    
+    cancel_prefetches()
+    task = asyncio.create_task(_generate_module_content(module_number, research, roadmap))
+    # Retrieve the exception of a prefetch nobody ends up awaiting
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    _module_prefetch[_prefetch_key(tool_name, module_number, research, roadmap)] = task
+
+
+def cancel_prefetches() -> None:
+    for task in _module_prefetch.values():
+        task.cancel()
+    _module_prefetch.clear()
+
+
+async def build_module(tool_name: str, module_number: int, tool_context: "ToolContext") -> dict:
+    """
+    Generates a complete module (lesson, examples, quiz) and saves it.
+    
+    Lesson, examples and quiz come from one batched module builder call (or
+    the teacher, example and quiz specialists running concurrently). Research
+    and roadmap come from session state when already loaded. Once saved, the next
+    module is generated speculatively so it is ready when the user asks.
+    
+    Args:
+        tool_name: Name of the tool
+        module_number: Module number (1, 2, 3, etc.)
+        
+    Returns:
+        Dictionary with the saved module's file path
+    """
+    try:
+        context = await _load_module_context(tool_name, tool_context)
+        if context is None:
+            return {
+                "status": "error",
+                "error_message": "research.md and roadmap.md are required. Research and plan the tool first."
+            }
+        
+        research, roadmap = context
+        
+        # Use the speculative build if one was started for this exact context
+        content = None
+        prefetched = _module_prefetch.pop(_prefetch_key(tool_name, module_number, research, roadmap), None)
+        if prefetched is not None:
+            try:
+                content = await prefetched
+            except Exception:
+                # The prefetch failed; generate it now instead. (Cancelled prefetches
+                # are removed from _module_prefetch, so they never get here.)
+                pass
+        if content is None:
+            content = await _generate_module_content(module_number, research, roadmap)
+        
+        lesson, examples, quiz = content
+        result = await assemble_module_file(tool_name, module_number, lesson, examples, quiz)
+        
+        if result["status"] == "success":
+            _schedule_prefetch(tool_name, module_number + 1, research, roadmap)
+        return result
+    except Exception as e:
+        return {
+            "status": "error",
+            "error_message": f"Failed to build module: {str(e)}"
+        }
+
+
+# =============================================================================
+# MAIN ORCHESTRATOR AGENT
+# =============================================================================
+
+def _trim_history(callback_context, llm_request):
+    """before_model_callback: keeps only the last MAX_HISTORY_TURNS user turns in the prompt."""
+    # A turn starts at a user text message; cutting there never separates a
+    # function call from its response
+    starts = [
+        index for index, content in enumerate(llm_request.contents)
+        if content.role == "user" and any(part.text for part in content.parts or [])
     ]
-)
+    if len(starts) > MAX_HISTORY_TURNS:
+        del llm_request.contents[:starts[-MAX_HISTORY_TURNS]]
+    return None
+
+
+# Main Agent - Orchestrates specialist agents (ADK recommended pattern)
+@cache
+def get_main_agent() -> "LlmAgent":
+    from google.adk.agents import LlmAgent
+    from google.adk.tools import AgentTool, FunctionTool
+    return LlmAgent(
+        model=get_shared_model(),
+        name="main_agent",
+        description="Master orchestrator for the newToolNoProblem AI Learning Assistant.",
+        instruction=_MAIN_INSTR,
+        tools=[
+            AgentTool(agent=get_tracker_agent()),
+            AgentTool(agent=get_notifier_agent()),
+            FunctionTool(func=read_from_tool_folder),
+            FunctionTool(func=create_learning_plan),
+            FunctionTool(func=build_module)
+        ],
+        before_model_callback=_trim_history
+    )
+
 
 # =============================================================================
 # MAIN EXECUTION
 # =============================================================================
 
-async def main():
-    # Initialize Rich console for beautiful markdown rendering
-    console = Console()
+APP_NAME = "newToolNoProblem"
+
+# Process-wide services shared by every Runner. The learner's conversation is
+# persisted so a restart resumes it instead of starting from scratch.
+@cache
+def get_session_service():
+    from google.adk.sessions import DatabaseSessionService
+    return DatabaseSessionService(db_url=SESSION_DB_URL)
+
+
+@cache
+def get_memory_service():
+    from google.adk.memory import InMemoryMemoryService
+    return InMemoryMemoryService()
+
+
+def _logging_plugin():
+    """
+    LoggingPlugin that skips partial (streamed) events, which would otherwise
+    print a block of log lines for every chunk of a streaming response.
+    """
+    from google.adk.plugins.logging_plugin import LoggingPlugin
     
-    print("=" * 70)
-    print("        🎓 newToolNoProblem - AI Learning Assistant 🚀")
-    print("=" * 70)
-    print("\n📌 Mission: Help developers master emerging AI tools quickly!")
-    print("\n💡 Features:")
-    print("  • Comprehensive research & learning roadmaps")
-    print("  • Module-by-module structured lessons")
-    print("  • Practical code examples (3-5 per module)")
-    print("  • Comprehensive quizzes with gradual difficulty")
-    print("  • Progress tracking & motivation")
-    print("\n💾 Organization: All lessons saved to lessons/[tool_name]/ folder")
-    print("\n" + "=" * 70)
-    
-    # Initialize Session Service
-    session_service = InMemorySessionService()
-    session_id = "user_session"
-    user_id = "learner_001"
+    class FinalEventLoggingPlugin(LoggingPlugin):
+        async def on_event_callback(self, *, invocation_context, event):
+            if event.partial:
+                return None
+            return await super().on_event_callback(invocation_context=invocation_context, event=event)
     
-    await session_service.create_session(
-        app_name="newToolNoProblem",
+    return FinalEventLoggingPlugin()
+
+
+async def _remember_session(user_id: str, session_id: str) -> None:
+    """Adds the conversation so far to memory so `load_memory` can retrieve it."""
+    session = await get_session_service().get_session(
+        app_name=APP_NAME,
         user_id=user_id,
         session_id=session_id
     )
+    if session is not None:
+        await get_memory_service().add_session_to_memory(session)
+
+
+class _StreamingMarkdown:
+    """
+    Live renderable holding the streamed text. Markdown is parsed only when
+    Live refreshes (on its own thread), not once per token on the event loop.
+    """
+    def __init__(self):
+        self.text = ""
+    
+    def __rich__(self):
+        from rich.markdown import Markdown
+        return Markdown(self.text)
+
+
+def _event_text(event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text or "" for part in event.content.parts)
+
+
+async def _stream_turn(runner, run_config, user_id: str, session_id: str, message, console, progress: dict) -> str:
+    """
+    Runs one user turn, streaming the response into a live view; returns the
+    final text. Sets progress["started"] once the first event arrives, after
+    which tools may already have run and the turn must not be resent.
+    """
+    from rich.live import Live
+    
+    response_text = ""
+    stream = _StreamingMarkdown()
+    # Refresh rate caps rendering cost regardless of token rate
+    with Live(stream, console=console, refresh_per_second=8, transient=True):
+        async for event in runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=message,
+            run_config=run_config
+        ):
+            progress["started"] = True
+            text = _event_text(event)
+            if event.partial:
+                # Token deltas of the response being generated
+                if text:
+                    response_text += text
+                    stream.text = response_text
+            elif event.is_final_response():
+                response_text = text
+            else:
+                # This model turn ended in a tool call; drop its preamble
+                response_text = ""
+                stream.text = ""
+    return response_text
+
+
+def _error_kind(error: Exception) -> str:
+    """Classifies a failed turn as "transient" (worth retrying), "auth" or "other"."""
+    import httpx
+    from google.genai import errors
+    
+    if isinstance(error, (asyncio.TimeoutError, httpx.TransportError, errors.ServerError)):
+        return "transient"
+    if isinstance(error, errors.ClientError):
+        if error.code == 429:
+            return "transient"
+        if error.code in (401, 403):
+            return "auth"
+    return "other"
+
+
+async def _ainput(prompt: str) -> str:
+    """
+    input() that doesn't block the event loop. Reads on a daemon thread so a
+    pending prompt never holds up interpreter shutdown (e.g. after Ctrl+C).
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def resolve(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read():
+        try:
+            line = input(prompt)
+        except BaseException as e:
+            callback = (resolve, future.set_exception, e)
+        else:
+            callback = (resolve, future.set_result, line)
+        try:
+            loop.call_soon_threadsafe(*callback)
+        except RuntimeError:
+            pass  # Event loop already closed
+    
+    threading.Thread(target=read, name="stdin-reader", daemon=True).start()
+    return await future
+
+
+async def _prewarm() -> None:
+    """Builds the shared genai client and preloads the most recently used tool's research and roadmap."""
+    def load_lexer():
+        # Code-block highlighting otherwise imports the lexer on first render
+        from pygments.lexers import get_lexer_by_name
+        get_lexer_by_name("python")
+    
+    def load_recent():
+        try:
+            with os.scandir(LESSONS_DIR) as entries:
+                folders = [entry for entry in entries if entry.is_dir()]
+        except FileNotFoundError:
+            return
+        if not folders:
+            return
+        
+        latest = max(folders, key=lambda entry: entry.stat().st_mtime)
+        for filename in ("research.md", "roadmap.md"):
+            try:
+                _read_text_cached(os.path.join(latest.path, filename))
+            except FileNotFoundError:
+                pass
+    
+    try:
+        # Built on the event loop: the model caches its client per running
+        # loop, so one built on a worker thread would never be used
+        get_shared_model().api_client
+    except Exception:
+        pass  # Best effort; a cold start only costs a little latency later
+    try:
+        await asyncio.to_thread(load_lexer)
+    except Exception:
+        pass
+    try:
+        # Only the disk read belongs on the tool I/O pool
+        await _run_io(load_recent)
+    except Exception:
+        pass
+
+
+# Console text is built once and written (and flushed) in one go
+BANNER: Final[str] = "\n".join([
+    "=" * 70,
+    "        🎓 newToolNoProblem - AI Learning Assistant 🚀",
+    "=" * 70,
+    "\n📌 Mission: Help developers master emerging AI tools quickly!",
+    "\n💡 Features:",
+    "  • Comprehensive research & learning roadmaps",
+    "  • Module-by-module structured lessons",
+    "  • Practical code examples (3-5 per module)",
+    "  • Comprehensive quizzes with gradual difficulty",
+    "  • Progress tracking & motivation",
+    "\n💾 Organization: All lessons saved to lessons/[tool_name]/ folder",
+    "\n" + "=" * 70,
+    ""
+])
+
+HELP_TEXT: Final[str] = "\n".join([
+    "\n📖 Available Commands:",
+    "  • 'learn [tool name]' - Research & create learning roadmap",
+    "  • 'start module 1' - Generate complete module (lesson+examples+quiz)",
+    "  • 'progress' - Check your learning progress",
+    "  • 'help' - Show this help message",
+    "  • 'exit' - Quit the assistant",
+    "\n💡 Tip: All lessons saved to lessons/[tool_name]/ folder\n",
+    ""
+])
+
+
+def _write(text: str) -> None:
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+async def main():
+    _write(BANNER)
+    
+    # Heavy imports happen after the banner is on screen
+    from google.adk.agents.run_config import RunConfig, StreamingMode
+    from google.adk.runners import Runner
+    from google.genai import types
+    from rich.console import Console
+    from rich.markdown import Markdown
+    
+    # Initialize Rich console for beautiful markdown rendering
+    console = Console()
+    
+    # Each run is a new session (so its memory entry never replaces an earlier
+    # run's) that carries over the latest previous run's state
+    user_id = "learner_001"
+    session_id = f"session_{datetime.now():%Y%m%d_%H%M%S}"
     
-    # Initialize Memory Service for long-term context
-    memory_service = InMemoryMemoryService()
+    try:
+        state = {}
+        listed = await get_session_service().list_sessions(app_name=APP_NAME, user_id=user_id)
+        if listed.sessions:
+            latest = max(listed.sessions, key=lambda session: session.last_update_time)
+            previous = await get_session_service().get_session(
+                app_name=APP_NAME,
+                user_id=user_id,
+                session_id=latest.id
+            )
+            if previous is not None:
+                # Let load_memory see the last conversation straight away
+                await get_memory_service().add_session_to_memory(previous)
+                state = {key: value for key, value in previous.state.items() if not key.startswith("temp:")}
+        await get_session_service().create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id,
+            state=state
+        )
+    except Exception as e:
+        # e.g. the database extra isn't installed or the URL has no async driver
+        print(f"❌ Could not open the session database ({SESSION_DB_URL}): {e}")
+        print("Install the dependencies with: pip install -r requirements.txt")
+        return
     
     # Initialize Runner with Logging Plugin
     runner = Runner(
-        agent=main_agent,
-        app_name="newToolNoProblem",
-        session_service=session_service,
-        memory_service=memory_service,
-        plugins=[LoggingPlugin()]
+        agent=get_main_agent(),
+        app_name=APP_NAME,
+        session_service=get_session_service(),
+        memory_service=get_memory_service(),
+        plugins=[_logging_plugin()]
     )
     
+    # Stream partial responses (SSE) so text renders as it is generated
+    run_config = RunConfig(streaming_mode=StreamingMode.SSE)
+    
+    # Write session changes back in the background; SIGTERM exits through
+    # atexit so the final flush still runs
+    flush_task = asyncio.create_task(_periodic_session_flush())
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    
     print("\n✅ System ready! Type 'help' for commands or 'exit' to quit.\n")
     
+    # Warm caches while the user types their first request
+    prewarm_task = asyncio.create_task(_prewarm())
+    
     while True:
-        user_input = input("You: ")
+        user_input = (await _ainput("You: ")).strip()
+        if not user_input:
+            continue
         
-        if user_input.lower() in ["exit", "quit"]:
+        command = user_input.lower()
+        if command in {"exit", "quit"}:
+            cancel_prefetches()
+            prewarm_task.cancel()
+            flush_task.cancel()
+            await flush_sessions()
             print("\n👋 Goodbye! Keep learning, keep growing! 🚀")
             break
         
-        if user_input.lower() == "help":
-            print("\n📖 Available Commands:")
-            print("  • 'learn [tool name]' - Research & create learning roadmap")
-            print("  • 'start module 1' - Generate complete module (lesson+examples+quiz)")
-            print("  • 'progress' - Check your learning progress")
-            print("  • 'help' - Show this help message")
-            print("  • 'exit' - Quit the assistant")
-            print("\n💡 Tip: All lessons saved to lessons/[tool_name]/ folder\n")
-            continue
-            
-        if not user_input.strip():
+        if command == "help":
+            _write(HELP_TEXT)
             continue
         
         print("\n🤖 Assistant:")
         print("-" * 70)
         
         try:
-            async for event in runner.run_async(
-                user_id=user_id,
-                session_id=session_id,
-                new_message=types.Content(parts=[types.Part(text=user_input)])
-            ):
-                if event.is_final_response() and event.content:
-                    response_text = event.content.parts[0].text
-                    # Render markdown beautifully using Rich
-                    md = Markdown(response_text)
-                    console.print(md)
+            message = types.Content(parts=[types.Part(text=user_input)])
+            for attempt in range(TURN_RETRIES + 1):
+                progress = {"started": False}
+                try:
+                    response_text = await _stream_turn(runner, run_config, user_id, session_id, message, console, progress)
+                    break
+                except Exception as e:
+                    # Transient failures are retried here so the user doesn't have to retype,
+                    # but only if nothing came back yet: once events arrive, tools may have run
+                    if progress["started"] or attempt == TURN_RETRIES or _error_kind(e) != "transient":
+                        raise
+                    delay = RETRY_OPTIONS["initial_delay"] * RETRY_OPTIONS["exp_base"] ** attempt
+                    print(f"⏳ Gemini is busy or unreachable ({e}); retrying in {delay}s...")
+                    await asyncio.sleep(delay)
+            
+            # Render the final markdown beautifully using Rich, off the event loop
+            if response_text:
+                await asyncio.to_thread(lambda: console.print(Markdown(response_text)))
+            
+            # Make this turn available to long-term memory
+            await _remember_session(user_id, session_id)
         except Exception as e:
-            print(f"❌ Error: {e}")
-            print("Please try again or type 'help' for assistance.")
+            kind = _error_kind(e)
+            if kind == "auth":
+                print(f"❌ Gemini rejected the request ({e}).")
+                print("Check GOOGLE_API_KEY in your .env file.")
+            elif kind == "transient":
+                print(f"❌ Gemini is still unavailable ({e}).")
+                print("Please wait a minute and try again.")
+            else:
+                print(f"❌ Error: {e}")
+                print("Please try again or type 'help' for assistance.")
         
         print("-" * 70 + "\n")
 